@@ -6,9 +6,12 @@ Then, it will export the mesh as a .fbx file for Roblox Studio to import.
 
 import sys
 import os
+import json
+import shutil
 import subprocess
 import asyncio
 import logging
+import numpy as np
 from pathlib import Path
 
 # try to import bpy (only works inside blender)
@@ -22,10 +25,134 @@ except ImportError:
     bpy = None
     bmesh = None
 
+# try to import meshoptimizer + trimesh for fast pre-Blender decimation
+try:
+    import trimesh
+    import meshoptimizer
+
+    MESHOPT_AVAILABLE = True
+except ImportError:
+    MESHOPT_AVAILABLE = False
+    trimesh = None
+    meshoptimizer = None
+
 # logging config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Roblox UGC limit is 10K triangles, leave headroom for the Blender pass
+MESHOPT_TARGET_INDEX_COUNT = 30000
+MESHOPT_TARGET_ERROR = 0.01
+
+# persistent worker script launched inside Blender
+WORKER_SCRIPT = Path(__file__).parent / "blender_worker.py"
+
+# resolved Blender path survives restarts here, so we skip the --version probes
+BLENDER_PATH_CACHE = Path.home() / ".cache" / "ugc_pipeline" / "blender_path"
+
+# pool size: half the cores, capped — each worker is a full Blender process
+WORKER_POOL_SIZE = max(1, min((os.cpu_count() or 2) // 2, 4))
+
+
+class BlenderWorker:
+    """One persistent background Blender process and its job socket"""
+
+    def __init__(self, blender_executable: str):
+        self.blender_executable = blender_executable
+        self._process = None
+        self._server = None
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()  # bpy is not thread-safe, serialize jobs
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._writer is not None
+            and self._process is not None
+            and self._process.returncode is None
+        )
+
+    async def start(self) -> bool:
+        """Start the background Blender process and wait for it to connect"""
+        if self.alive:
+            return True
+
+        try:
+            connected = asyncio.get_running_loop().create_future()
+
+            def on_connect(reader, writer):
+                if not connected.done():
+                    connected.set_result((reader, writer))
+
+            self._server = await asyncio.start_server(on_connect, "127.0.0.1", 0)
+            port = self._server.sockets[0].getsockname()[1]
+
+            env = os.environ.copy()
+            env["BLENDER_WORKER_PORT"] = str(port)
+
+            self._process = await asyncio.create_subprocess_exec(
+                self.blender_executable,
+                "--background",
+                "--python",
+                str(WORKER_SCRIPT),
+                env=env,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+
+            # blender startup + python init can take a few seconds
+            self._reader, self._writer = await asyncio.wait_for(connected, timeout=60)
+            logger.info("Persistent Blender worker started")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to start persistent Blender worker: {e}")
+            await self.stop()
+            return False
+
+    async def stop(self):
+        """Tear down the worker (best effort)"""
+        if self._writer:
+            try:
+                self._writer.write(b'{"cmd": "shutdown"}\n')
+                await self._writer.drain()
+                self._writer.close()
+            except Exception:
+                pass
+        if self._server:
+            self._server.close()
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+        self._process = None
+        self._server = None
+        self._reader = None
+        self._writer = None
+
+    async def run_job(self, mesh_path: str, fbx_output: str, decimate: bool) -> str:
+        """Send one job to the worker and wait for its reply"""
+        async with self._lock:
+            job = {
+                "input_path": mesh_path,
+                "fbx_output": fbx_output,
+                "decimate": decimate,
+            }
+            self._writer.write((json.dumps(job) + "\n").encode())
+            await self._writer.drain()
+
+            reply_line = await asyncio.wait_for(self._reader.readline(), timeout=600)
+            if not reply_line:
+                raise Exception("Blender worker closed the connection")
+
+            reply = json.loads(reply_line)
+            if reply.get("status") != "ok":
+                raise Exception(reply.get("error", "Unknown Blender worker error"))
+
+            return fbx_output
+
 
 class BlenderProcessor:
     def __init__(self):
@@ -36,8 +163,22 @@ class BlenderProcessor:
         if not self.blender_executable:
             logger.warning("Blender executable not found. Please install Blender.")
 
+        # persistent Blender worker pool (started lazily on first task)
+        self._workers: list[BlenderWorker] = []
+        self._idle_workers: asyncio.Queue = asyncio.Queue()
+        self._pool_lock = asyncio.Lock()
+
     def find_blender_executable(self) -> str:
         """Find Blender executable on the system"""
+        # fast path: reuse the path resolved on a previous startup
+        try:
+            cached = BLENDER_PATH_CACHE.read_text().strip()
+            if cached and os.path.exists(cached):
+                logger.info(f"Using cached Blender path: {cached}")
+                return cached
+        except OSError:
+            pass
+
         possible_paths = [
             "C:\\Program Files\\Blender Foundation\\Blender 4.0\\blender.exe",
             "C:\\Program Files\\Blender Foundation\\Blender 3.6\\blender.exe",
@@ -46,20 +187,131 @@ class BlenderProcessor:
         ]
 
         for path in possible_paths:
-            if os.path.exists(path) or path == "blender":
-                try:
-                    # test if blender runs
-                    result = subprocess.run(
-                        [path, "--version"], capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0:
-                        logger.info(f"Found Blender at: {path}")
-                        return path
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    continue
+            # which() resolves PATH entries without spawning a process, so we
+            # never pay a --version subprocess for a binary that doesn't exist
+            resolved = path if os.path.exists(path) else shutil.which(path)
+            if not resolved:
+                continue
+
+            try:
+                # test if blender runs
+                result = subprocess.run(
+                    [resolved, "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+                if result.returncode == 0:
+                    logger.info(f"Found Blender at: {resolved}")
+                    self._cache_blender_path(resolved)
+                    return resolved
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                continue
 
         return None
 
+    def _cache_blender_path(self, path: str):
+        """Remember the resolved Blender path for the next startup (best effort)"""
+        try:
+            BLENDER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            BLENDER_PATH_CACHE.write_text(path)
+        except OSError as e:
+            logger.warning(f"Could not cache Blender path: {e}")
+
+    def presimplify_mesh(self, mesh_path: str) -> bool:
+        """
+        Decimate the mesh with meshoptimizer's quadric simplifier before Blender runs.
+
+        meshoptimizer is SIMD-optimized C and much faster than Blender's
+        single-threaded decimator on large TripoSR outputs. Returns True if the
+        mesh was simplified in place, False if meshoptimizer is unavailable or failed.
+        """
+        if not MESHOPT_AVAILABLE:
+            return False
+
+        try:
+            mesh = trimesh.load(mesh_path, force="mesh")
+            vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+            indices = np.ascontiguousarray(mesh.faces.reshape(-1), dtype=np.uint32)
+
+            if len(indices) <= MESHOPT_TARGET_INDEX_COUNT:
+                return False  # already under target, skip
+
+            # destination-buffer API (pypi meshoptimizer): simplify returns
+            # the new index count into a preallocated buffer
+            dest = np.empty(len(indices), dtype=np.uint32)
+            new_count = meshoptimizer.simplify(
+                dest,
+                indices,
+                vertices,
+                target_index_count=MESHOPT_TARGET_INDEX_COUNT,
+                target_error=MESHOPT_TARGET_ERROR,
+            )
+            simplified = dest[:new_count].copy()
+
+            # reorder for cache-coherent output
+            cache_opt = np.empty(new_count, dtype=np.uint32)
+            meshoptimizer.optimize_vertex_cache(
+                cache_opt, simplified, vertex_count=len(vertices)
+            )
+            # remaps cache_opt in place and returns the unique vertex count
+            new_vertices = np.empty_like(vertices)
+            unique = meshoptimizer.optimize_vertex_fetch(
+                new_vertices, cache_opt, vertices
+            )
+
+            mesh = trimesh.Trimesh(
+                vertices=new_vertices[:unique], faces=cache_opt.reshape(-1, 3)
+            )
+            mesh.export(mesh_path)
+            logger.info(f"Pre-simplified mesh to {new_count // 3} triangles")
+            return True
+
+        except Exception as e:
+            logger.warning(f"meshoptimizer pre-simplification failed: {e}")
+            return False
+
+    async def _ensure_pool(self) -> bool:
+        """Spin the worker pool up to WORKER_POOL_SIZE (lazily, once)"""
+        if not self.blender_executable:
+            return False
+
+        async with self._pool_lock:
+            # drop workers whose Blender process died
+            for worker in [w for w in self._workers if not w.alive]:
+                await worker.stop()
+                self._workers.remove(worker)
+
+            while len(self._workers) < WORKER_POOL_SIZE:
+                worker = BlenderWorker(self.blender_executable)
+                if not await worker.start():
+                    break  # startup failure, don't retry the rest this round
+                self._workers.append(worker)
+                self._idle_workers.put_nowait(worker)
+
+            return bool(self._workers)
+
+    async def _submit_to_pool(
+        self, mesh_path: str, fbx_output: str, decimate: bool
+    ) -> str:
+        """Run one job on the next idle worker"""
+        # a worker can die while sitting in the idle queue (_ensure_pool only
+        # prunes self._workers) - skip those instead of handing them a job
+        while True:
+            worker = await asyncio.wait_for(self._idle_workers.get(), timeout=600)
+            if worker.alive:
+                break
+            await worker.stop()
+        try:
+            return await worker.run_job(mesh_path, fbx_output, decimate)
+        except Exception:
+            # broken worker: drop it so _ensure_pool replaces it next task
+            await worker.stop()
+            raise
+        finally:
+            if worker.alive:
+                self._idle_workers.put_nowait(worker)
+
     async def roblox_preprocessing(self, mesh_path: str, task_id: str) -> str:
         """
         Process mesh to satisfy Roblox UGC requirements
@@ -74,10 +326,27 @@ class BlenderProcessor:
 
             fbx_output = output_dir / f"ugc_{task_id}.fbx"
 
+            # decimate with meshoptimizer up front so Blender only triangulates + unwraps + exports
+            presimplified = self.presimplify_mesh(mesh_path)
+
+            # preferred path: warm worker pool, pays no Blender startup cost per task
+            # and processes bursts in parallel across workers
+            if await self._ensure_pool():
+                try:
+                    return await self._submit_to_pool(
+                        mesh_path, str(fbx_output), decimate=not presimplified
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Blender worker failed ({e}), falling back to one-shot subprocess"
+                    )
+
+            # fallback path: one-shot blender --background run
             # create Blender script (only 2 parameters now)
             script_content = self.generate_blender_script(
                 input_path=mesh_path,
                 fbx_output=str(fbx_output),
+                decimate=not presimplified,
             )
 
             # save script to temporary file
@@ -118,8 +387,15 @@ class BlenderProcessor:
             logger.error(f"Error in Blender processing: {e}")
             raise
 
-    def generate_blender_script(self, input_path: str, fbx_output: str) -> str:
+    def generate_blender_script(
+        self, input_path: str, fbx_output: str, decimate: bool = True
+    ) -> str:
         """Generate Blender Python script for processing"""
+        decimate_line = (
+            "bmesh.ops.decimate(bm, verts=bm.verts[:], factor=0.3)  # Adjust based on original mesh complexity"
+            if decimate
+            else "# mesh already decimated by meshoptimizer"
+        )
         return f"""
 import bpy
 import bmesh
@@ -132,7 +408,13 @@ bpy.ops.object.delete(use_global=False)
 # import mesh
 input_path = r"{input_path}"
 if input_path.endswith('.obj'):
-    bpy.ops.import_scene.obj(filepath=input_path)
+    if bpy.app.version >= (3, 4):
+        # C++ OBJ importer (3.4+), ~10x faster than the legacy python one
+        bpy.ops.wm.obj_import(filepath=input_path)
+    else:
+        bpy.ops.import_scene.obj(filepath=input_path)
+elif input_path.endswith('.glb') or input_path.endswith('.gltf'):
+    bpy.ops.import_scene.gltf(filepath=input_path)
 elif input_path.endswith('.ply'):
     bpy.ops.import_mesh.ply(filepath=input_path)
 else:
@@ -154,33 +436,24 @@ if not obj:
 bpy.context.view_layer.objects.active = obj
 obj.select_set(True)
 
-# enter edit mode
-bpy.ops.object.mode_set(mode='EDIT')
-
-# get rid of doubles/merge by distance
-bmesh_obj = bmesh.from_mesh(obj.data)
-bmesh.ops.remove_doubles(bmesh_obj, verts=bmesh_obj.verts, dist=0.001)
-bmesh_obj.to_mesh(obj.data)
-bmesh_obj.free()
-
-# exit edit mode
-bpy.ops.object.mode_set(mode='OBJECT')
-
 # apply scale + rotation
 bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
 
 # Roblox UGC Requirements Processing
 
-# 1. decimate mesh to reduce polygon count (Roblox limit: 10K triangles)
-decimate_modifier = obj.modifiers.new(name="Decimate", type='DECIMATE')
-decimate_modifier.ratio = 0.3  # Adjust based on original mesh complexity
-bpy.ops.object.modifier_apply(modifier=decimate_modifier.name)
-
-# 2. triangulate the mesh
-triangulate_modifier = obj.modifiers.new(name="Triangulate", type='TRIANGULATE')
-bpy.ops.object.modifier_apply(modifier=triangulate_modifier.name)
-
-# 3. UV Unwrapping
+# clean + decimate + triangulate in one Object Mode bmesh pass - no EDIT/OBJECT
+# toggling, so no depgraph rebuild per mode switch
+bm = bmesh.new()
+bm.from_mesh(obj.data)
+bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=0.001)
+bmesh.ops.dissolve_degenerate(bm, dist=0.0001, edges=bm.edges[:])
+{decimate_line}
+bmesh.ops.triangulate(bm, faces=bm.faces[:])
+bm.to_mesh(obj.data)
+bm.free()
+
+# UV Unwrapping - the unwrap operator still requires Edit Mode, so this is the
+# single remaining mode toggle in the script
 bpy.ops.object.mode_set(mode='EDIT')
 bpy.ops.mesh.select_all(action='SELECT')
 bpy.ops.uv.unwrap(method='ANGLE_BASED', margin=0.001)
@@ -233,7 +506,11 @@ def run_standalone_processing():
 
         # import mesh
         if input_path.endswith(".obj"):
-            bpy.ops.import_scene.obj(filepath=input_path)
+            if bpy.app.version >= (3, 4):
+                # C++ OBJ importer (3.4+), ~10x faster than the legacy python one
+                bpy.ops.wm.obj_import(filepath=input_path)
+            else:
+                bpy.ops.import_scene.obj(filepath=input_path)
 
         # get mesh obj
         obj = next((o for o in bpy.context.scene.objects if o.type == "MESH"), None)
@@ -243,18 +520,20 @@ def run_standalone_processing():
         bpy.context.view_layer.objects.active = obj
         obj.select_set(True)
 
-        # decimate
+        # decimate + triangulate: stack the modifiers without applying them.
+        # The FBX exporter evaluates the modifier stack exactly once via
+        # use_mesh_modifiers, so applying here would just add a second full
+        # depgraph evaluation and a mesh copy.
         decimate_modifier = obj.modifiers.new(name="Decimate", type="DECIMATE")
         decimate_modifier.ratio = 0.5
-        bpy.ops.object.modifier_apply(modifier=decimate_modifier.name)
-
-        # triangulate
-        triangulate_modifier = obj.modifiers.new(name="Triangulate", type="TRIANGULATE")
-        bpy.ops.object.modifier_apply(modifier=triangulate_modifier.name)
+        obj.modifiers.new(name="Triangulate", type="TRIANGULATE")
 
-        # export
+        # export (evaluates the modifier stack)
         bpy.ops.export_scene.fbx(
-            filepath=fbx_output, use_selection=True, apply_scale_options="FBX_SCALE_ALL"
+            filepath=fbx_output,
+            use_selection=True,
+            apply_scale_options="FBX_SCALE_ALL",
+            use_mesh_modifiers=True,
         )
 
         print(f"Successfully exported to: {fbx_output}")
@@ -0,0 +1,154 @@
+"""
+Persistent Blender worker process.
+
+Launched once as `blender --background --python blender_worker.py` by
+BlenderProcessor and kept alive between tasks, so each job only pays the
+mesh-processing cost instead of the ~2-5s Blender startup. Jobs arrive as
+JSON lines over a localhost socket (port in BLENDER_WORKER_PORT); each job
+is {"input_path": ..., "fbx_output": ..., "decimate": ...} and gets a
+{"status": "ok"} / {"status": "error", "error": ...} reply.
+"""
+
+import json
+import os
+import socket
+import sys
+import traceback
+
+import bpy
+import bmesh
+
+
+# scratch bmesh shared by all jobs: cleared between tasks but never freed,
+# so the C-side vert/edge/face pools stay allocated while the worker lives
+_scratch_bm = None
+
+
+def get_scratch_bmesh():
+    """Return the shared bmesh, emptied and ready for the next job"""
+    global _scratch_bm
+    if _scratch_bm is None:
+        _scratch_bm = bmesh.new()
+    else:
+        _scratch_bm.clear()
+    return _scratch_bm
+
+
+def clear_scene():
+    """Remove every object so jobs don't leak meshes into each other"""
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete(use_global=False)
+    # purge orphaned mesh data left behind by the delete
+    for mesh in list(bpy.data.meshes):
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def process_job(input_path: str, fbx_output: str, decimate: bool = True):
+    """Run the Roblox UGC mesh pipeline for one job"""
+    clear_scene()
+
+    # import mesh
+    if input_path.endswith(".obj"):
+        if bpy.app.version >= (3, 4):
+            # C++ OBJ importer (3.4+), ~10x faster than the legacy python one
+            bpy.ops.wm.obj_import(filepath=input_path)
+        else:
+            bpy.ops.import_scene.obj(filepath=input_path)
+    elif input_path.endswith((".glb", ".gltf")):
+        bpy.ops.import_scene.gltf(filepath=input_path)
+    elif input_path.endswith(".ply"):
+        bpy.ops.import_mesh.ply(filepath=input_path)
+    else:
+        raise ValueError(f"Unsupported file format: {input_path}")
+
+    obj = next((o for o in bpy.context.scene.objects if o.type == "MESH"), None)
+    if not obj:
+        raise RuntimeError("No mesh object found after import")
+
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+
+    # apply scale + rotation
+    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+
+    # clean + decimate + triangulate in a single pass on the reused bmesh
+    bm = get_scratch_bmesh()
+    bm.from_mesh(obj.data)
+    bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=0.001)
+    bmesh.ops.dissolve_degenerate(bm, dist=0.0001, edges=bm.edges[:])
+    if decimate:
+        bmesh.ops.decimate(bm, verts=bm.verts[:], factor=0.3)
+    bmesh.ops.triangulate(bm, faces=bm.faces[:])
+    bm.to_mesh(obj.data)
+
+    # UV unwrapping
+    bpy.ops.object.mode_set(mode="EDIT")
+    bpy.ops.mesh.select_all(action="SELECT")
+    bpy.ops.uv.unwrap(method="ANGLE_BASED", margin=0.001)
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    # center and scale to reasonable size (Roblox studs)
+    bpy.ops.object.origin_set(type="GEOMETRY_TO_ORIGIN", center="MEDIAN")
+    obj.scale = (2, 2, 2)
+    bpy.ops.object.transform_apply(scale=True)
+
+    # create material (basic for now)
+    mat = bpy.data.materials.new(name="UGC_Material")
+    mat.use_nodes = True
+    obj.data.materials.append(mat)
+
+    # export as FBX
+    bpy.ops.export_scene.fbx(
+        filepath=fbx_output,
+        use_selection=True,
+        apply_scale_options="FBX_SCALE_ALL",
+        object_types={"MESH"},
+        use_mesh_modifiers=True,
+        mesh_smooth_type="FACE",
+        use_tspace=True,
+    )
+
+
+def serve():
+    """Connect back to BlenderProcessor and process jobs until EOF/shutdown"""
+    port = int(os.environ["BLENDER_WORKER_PORT"])
+
+    sock = socket.create_connection(("127.0.0.1", port), timeout=30)
+    sock_file = sock.makefile("rw", encoding="utf-8")
+
+    for line in sock_file:
+        line = line.strip()
+        if not line:
+            continue
+
+        job = json.loads(line)
+        if job.get("cmd") == "shutdown":
+            break
+
+        try:
+            process_job(
+                input_path=job["input_path"],
+                fbx_output=job["fbx_output"],
+                decimate=job.get("decimate", True),
+            )
+            reply = {"status": "ok", "fbx_output": job["fbx_output"]}
+        except Exception as e:
+            traceback.print_exc()
+            reply = {"status": "error", "error": str(e)}
+
+        sock_file.write(json.dumps(reply) + "\n")
+        sock_file.flush()
+
+    global _scratch_bm
+    if _scratch_bm is not None:
+        _scratch_bm.free()
+        _scratch_bm = None
+
+    sock_file.close()
+    sock.close()
+
+
+if __name__ == "__main__":
+    serve()
+    sys.exit(0)
@@ -1,8 +1,13 @@
 import numpy as np
 from PIL import Image
+import io
+import itertools
 import os
+import shutil
 import sys
+import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 TRIPOSR_PATH = Path(__file__).parent.parent.parent / "models" / "TripoSR"
@@ -35,6 +40,96 @@ except ImportError:
     GPU_AVAILABLE = False
     logger.error("pytorch not available")
 
+# optional ONNX Runtime backend - an exported model at models/triposr.onnx is
+# preferred over the PyTorch checkpoint when onnxruntime is installed
+try:
+    import onnxruntime as ort
+
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+    ort = None
+
+# optional OpenCV resize - IPP/AVX2-accelerated, ~4-6x faster than stock
+# Pillow for the downscale to model input size
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
+ONNX_MODEL_PATH = Path(__file__).parent.parent.parent / "models" / "triposr.onnx"
+ONNX_OPTIMIZED_MODEL_PATH = ONNX_MODEL_PATH.with_suffix(".opt.onnx")
+ONNX_INPUT_SIZE = 256  # the exported model takes fixed (1, 3, 256, 256) input
+
+# micro-batching: coalesce concurrent single-view requests into one Run
+MICRO_BATCH_MAX = 8
+MICRO_BATCH_WAIT = 0.02  # seconds to linger for more requests
+
+# placeholder cube geometry: 8 corners and 12 triangles (1-based OBJ indices)
+# as contiguous numpy arrays - same layout real mesh output uses, so the OBJ
+# writer handles both through one savetxt path
+_CUBE_VERTICES = np.array(
+    [
+        [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],  # bottom face
+        [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],  # top face
+    ],
+    dtype=np.int8,
+)
+_CUBE_FACES = np.array(
+    [
+        [1, 2, 3], [1, 3, 4],  # bottom
+        [5, 6, 7], [5, 7, 8],  # top
+        [1, 2, 6], [1, 6, 5],  # front
+        [3, 4, 8], [3, 8, 7],  # back
+        [2, 3, 7], [2, 7, 6],  # right
+        [1, 4, 8], [1, 8, 5],  # left
+    ],
+    dtype=np.int32,
+)
+
+
+def _serialize_cube() -> str:
+    """Render the cube tables to OBJ text once at import"""
+    buf = io.StringIO()
+    np.savetxt(buf, _CUBE_VERTICES, fmt="v %d %d %d")
+    np.savetxt(buf, _CUBE_FACES, fmt="f %d %d %d")
+    return buf.getvalue()
+
+
+_PLACEHOLDER_CUBE_OBJ = _serialize_cube()
+
+
+def _next_mesh_index() -> int:
+    """First index no earlier run has used, across both mesh output dirs.
+
+    Scans for the highest numeric suffix rather than counting files, so
+    deleted meshes can't make a restarted server reuse (and overwrite) an
+    index that a persisted task still points at.
+    """
+    highest = -1
+    for directory in (Path("outputs"), Path("outputs/meshes")):
+        for path in directory.glob("*_*"):
+            suffix = path.stem.rsplit("_", 1)[-1]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+    return highest + 1
+
+
+def _resize_rgb(image: Image.Image, size: int) -> np.ndarray:
+    """Resize an RGB PIL image to (size, size), returned as a uint8 array.
+
+    Uses cv2.resize with INTER_AREA (the right filter for downscaling) when
+    OpenCV is installed, falling back to PIL otherwise.
+    """
+    if CV2_AVAILABLE:
+        return cv2.resize(
+            np.asarray(image), (size, size), interpolation=cv2.INTER_AREA
+        )
+    return np.asarray(image.resize((size, size)))
+
 
 class TripoSRPipeline:
     """
@@ -43,25 +138,311 @@ class TripoSRPipeline:
     TripoSR: https://github.com/VAST-AI-Research/TripoSR
     """
     
-    def __init__(self, lazy_load: bool = True):
+    def __init__(
+        self,
+        lazy_load: bool = True,
+        compile_model: bool = False,
+        device: str = None,
+    ):
         self.model = None
         self.device = None
         self._initialized = False
-        
+        # opt-in torch.compile for the PyTorch path (GPU only) - off by
+        # default since the first compiled forward pays tracing cost
+        self._compile_model = compile_model
+
+        # ONNX Runtime session state (used when an exported model is present)
+        self.session = None
+        self.input_name = None
+        self.output_name = None
+
+        # preallocated NCHW input buffer for the ONNX path - the fused
+        # conversion writes straight into it (safe while session runs are
+        # serialized on one executor thread)
+        self._in_buf = np.empty(
+            (1, 3, ONNX_INPUT_SIZE, ONNX_INPUT_SIZE), dtype=np.float32
+        )
+        self._nhwc = False  # set from the session's input shape on load
+
+        # guards lazy loading - concurrent requests hit _load_model from
+        # executor threads, so a threading.Lock keeps init single-shot
+        self._load_lock = threading.Lock()
+
+        # micro-batching queue + consumer task (created on first use, need a
+        # running loop); the task reference must live here - the loop only
+        # keeps a weak one, and a collected consumer strands every waiter
+        self._batch_queue = None
+        self._batch_consumer_task = None
+        # how many requests one Run may coalesce - lowered at session load
+        # if the model's batch dim turns out to be static
+        self._max_micro_batch = MICRO_BATCH_MAX
+
+        # dedicated executor for session runs (created with the session)
+        self._run_pool = None
+
+        # monotonic mesh filename counter: one scan at init, then next() per
+        # file instead of a directory scan - atomic under the GIL, so
+        # concurrent tasks can't pick the same index
+        self._mesh_seq = itertools.count(start=_next_mesh_index())
+
         if not TORCH_AVAILABLE:
             logger.error("cannot initialize pipeline: pytorch not available")
             return
             
-        self.device = torch.device("cuda" if GPU_AVAILABLE else "cpu")
+        # callers that already probed CUDA (e.g. the smoke test) can pass the
+        # device in so we don't touch the driver again
+        self.device = torch.device(device or ("cuda" if GPU_AVAILABLE else "cpu"))
         logger.info(f"Pipeline will use device: {self.device}")
         
         if not lazy_load:
             self._load_model()
     
+    def _build_session_options(self):
+        """Session options tuned for repeated fixed-shape inference"""
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # with the input shape fixed, mem-pattern planning + the CPU arena
+        # replay one precomputed allocation plan per run instead of hitting
+        # the allocator; env allocators share the arena across sessions
+        so.enable_mem_pattern = True
+        so.enable_cpu_mem_arena = True
+        so.add_session_config_entry("session.use_env_allocators", "1")
+        # persist the fused graph next to the original so later startups skip
+        # the optimization pass entirely
+        so.optimized_model_filepath = str(ONNX_OPTIMIZED_MODEL_PATH)
+        return so
+
+    def _fix_input_shapes(self, model_path: Path) -> Path:
+        """
+        Bake the fixed (3, 256, 256) image dims into the model input.
+
+        Free dimensions disable several DirectML fusions and ORT's memory
+        pattern planning; fixing them once on first run (cached next to the
+        original) lets ORT_ENABLE_ALL do its full job. The batch dim stays
+        symbolic - ORT validates static dims strictly, so baking it to 1
+        would reject every multi-view batch and coalesced micro-batch Run.
+        """
+        fixed_path = model_path.with_suffix(".fixed.onnx")
+        if fixed_path.exists():
+            return fixed_path
+
+        try:
+            import onnx
+            from onnxruntime.tools.onnx_model_utils import fix_output_shapes
+
+            model = onnx.load(str(model_path))
+            dims = model.graph.input[0].type.tensor_type.shape.dim
+            for i, value in zip(
+                (1, 2, 3), (3, ONNX_INPUT_SIZE, ONNX_INPUT_SIZE)
+            ):
+                dims[i].ClearField("dim_param")
+                dims[i].dim_value = value
+            fix_output_shapes(model)
+            onnx.save(model, str(fixed_path))
+            return fixed_path
+
+        except Exception as e:
+            logger.warning(f"Could not fix ONNX input shapes: {e}")
+            return model_path
+
+    def _convert_input_to_nhwc(self, model_path: Path) -> Path:
+        """
+        Re-export the model to take NHWC input (cached next to the original).
+
+        GPU/NPU backends prefer channels-last; feeding NHWC directly skips the
+        internal layout-conversion copy ORT would otherwise insert, and lets
+        preprocessing write pixels in native PIL order with no transpose.
+        The baked-in Transpose node constant-folds into the graph.
+        """
+        nhwc_path = model_path.with_suffix(".nhwc.onnx")
+        if nhwc_path.exists():
+            return nhwc_path
+
+        try:
+            import onnx
+            from onnx import TensorProto, helper
+
+            model = onnx.load(str(model_path))
+            graph = model.graph
+            original_input = graph.input[0]
+            name = original_input.name
+
+            # "batch" stays a free dim for the same reason as in
+            # _fix_input_shapes
+            nhwc_input = helper.make_tensor_value_info(
+                f"{name}_nhwc",
+                TensorProto.FLOAT,
+                ["batch", ONNX_INPUT_SIZE, ONNX_INPUT_SIZE, 3],
+            )
+            to_nchw = helper.make_node(
+                "Transpose",
+                inputs=[f"{name}_nhwc"],
+                outputs=[name],
+                perm=[0, 3, 1, 2],
+                name="nhwc_to_nchw",
+            )
+
+            graph.input.remove(original_input)
+            graph.input.insert(0, nhwc_input)
+            graph.node.insert(0, to_nchw)
+
+            onnx.save(model, str(nhwc_path))
+            return nhwc_path
+
+        except Exception as e:
+            logger.warning(f"Could not convert ONNX input to NHWC: {e}")
+            return model_path
+
+    def _quantize_model(self, model_path: Path, gpu: bool) -> Path:
+        """
+        Produce a reduced-precision variant of the model (cached).
+
+        fp16 on GPU providers halves memory bandwidth and engages Tensor
+        Cores; int8 dynamic weight quantization on CPU hits VNNI dot products.
+        Returns the original path if conversion isn't possible.
+        """
+        if gpu:
+            fp16_path = model_path.with_suffix(".fp16.onnx")
+            if fp16_path.exists():
+                return fp16_path
+            try:
+                import onnx
+                from onnxconverter_common import float16
+
+                model = float16.convert_float_to_float16(
+                    onnx.load(str(model_path)), keep_io_types=True
+                )
+                onnx.save(model, str(fp16_path))
+                return fp16_path
+            except Exception as e:
+                logger.warning(f"fp16 conversion failed: {e}")
+                return model_path
+
+        int8_path = model_path.with_suffix(".int8.onnx")
+        if int8_path.exists():
+            return int8_path
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(
+                str(model_path), str(int8_path), weight_type=QuantType.QInt8
+            )
+            return int8_path
+        except Exception as e:
+            logger.warning(f"int8 quantization failed: {e}")
+            return model_path
+
+    def _select_providers(self) -> list:
+        """
+        Pick the fastest available execution provider, in preference order
+        TensorRT > CUDA > DirectML > CPU, each with tuned options.
+        """
+        available = ort.get_available_providers()
+        providers = []
+
+        if "TensorrtExecutionProvider" in available:
+            providers.append(
+                (
+                    "TensorrtExecutionProvider",
+                    {
+                        "trt_fp16_enable": True,
+                        "trt_engine_cache_enable": True,
+                        "trt_engine_cache_path": str(
+                            ONNX_MODEL_PATH.parent / "trt_cache"
+                        ),
+                    },
+                )
+            )
+        if "CUDAExecutionProvider" in available:
+            providers.append(
+                (
+                    "CUDAExecutionProvider",
+                    {
+                        "cudnn_conv_algo_search": "EXHAUSTIVE",
+                        "do_copy_in_default_stream": True,
+                        # grow the device arena in power-of-two steps so the
+                        # fixed-shape workload settles after a few runs
+                        "arena_extend_strategy": "kNextPowerOfTwo",
+                    },
+                )
+            )
+        if "DmlExecutionProvider" in available:
+            providers.append(("DmlExecutionProvider", {"device_id": 0}))
+
+        providers.append(("CPUExecutionProvider", {}))
+        return providers
+
+    def _create_onnx_session(self):
+        """Create the ONNX Runtime session with fused graph + fixed shapes"""
+        providers = self._select_providers()
+
+        if ONNX_OPTIMIZED_MODEL_PATH.exists():
+            model_path = ONNX_OPTIMIZED_MODEL_PATH  # pre-fused on an earlier run
+        else:
+            model_path = self._fix_input_shapes(ONNX_MODEL_PATH)
+            model_path = self._convert_input_to_nhwc(model_path)
+            model_path = self._quantize_model(
+                model_path, gpu=providers[0][0] != "CPUExecutionProvider"
+            )
+
+        session = ort.InferenceSession(
+            str(model_path),
+            sess_options=self._build_session_options(),
+            providers=providers,
+        )
+        self.input_name = session.get_inputs()[0].name
+        self.output_name = session.get_outputs()[0].name
+
+        # detect input layout so preprocessing matches the model
+        input_shape = session.get_inputs()[0].shape
+        self._nhwc = len(input_shape) == 4 and input_shape[-1] == 3
+        if self._nhwc:
+            self._in_buf = np.empty(
+                (1, ONNX_INPUT_SIZE, ONNX_INPUT_SIZE, 3), dtype=np.float32
+            )
+
+        # a model with a static batch dim (e.g. an export or cached .fixed
+        # model baked to batch 1) rejects larger Runs under ORT's strict
+        # shape validation - cap coalescing at what it accepts
+        batch_dim = input_shape[0] if input_shape else None
+        if isinstance(batch_dim, int):
+            self._max_micro_batch = max(1, min(MICRO_BATCH_MAX, batch_dim))
+            if self._max_micro_batch < MICRO_BATCH_MAX:
+                logger.info(
+                    f"Static batch dim {batch_dim}: micro-batching capped at "
+                    f"{self._max_micro_batch}"
+                )
+
+        # all Runs go through one thread: the DML provider does not support
+        # multi-threaded Run on a session (latent crash under concurrent
+        # FastAPI tasks), and on CPU ORT already parallelizes internally via
+        # intra-op threads - it also keeps the shared input buffer race-free
+        self._run_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ort-run")
+
+        logger.info(f"ONNX session created with providers: {providers}")
+        return session
+
     def _load_model(self):
         if self._initialized:
             return
-            
+
+        with self._load_lock:
+            if self._initialized:  # another request won the race
+                return
+            self._load_model_locked()
+
+    def _load_model_locked(self):
+        # prefer the exported ONNX model when onnxruntime is installed
+        if ORT_AVAILABLE and ONNX_MODEL_PATH.exists():
+            try:
+                self.session = self._create_onnx_session()
+                self._initialized = True
+                return
+            except Exception as e:
+                logger.warning(f"ONNX session creation failed: {e}")
+                logger.info("Falling back to PyTorch model")
+
         try:
             from tsr.system import TSR
             
@@ -73,6 +454,16 @@ class TripoSRPipeline:
             )
             self.model.to(self.device)
             self.model.eval()
+
+            if GPU_AVAILABLE:
+                # fp16 + channels_last puts the conv layers on Tensor Cores
+                self.model = self.model.half().to(memory_format=torch.channels_last)
+
+                if self._compile_model:
+                    # reduce-overhead fuses kernels and cuts per-call python
+                    # dispatch; compilation itself happens on first forward
+                    self.model = torch.compile(self.model, mode="reduce-overhead")
+
             self._initialized = True
             logger.info("TripoSR model loaded successfully")
             
@@ -109,19 +500,22 @@ class TripoSRPipeline:
             logger.info(f"Generating 3D model from: {image_path}")
             
             image = self.preprocess_image(image_path)
-            
-            with torch.no_grad():
-                scene_codes = self.model([image], device=self.device)
-                meshes = self.model.extract_mesh(scene_codes)
+
+            # inference_mode skips autograd version-counter bookkeeping
+            with torch.inference_mode():
+                with torch.autocast("cuda", dtype=torch.float16, enabled=GPU_AVAILABLE):
+                    scene_codes = self.model([image], device=self.device)
+                    meshes = self.model.extract_mesh(scene_codes)
             
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            mesh_filename = f"mesh_{os.urandom(4).hex()}.obj"
+            # binary glb: one packed buffer write instead of O(V+F) text formatting
+            mesh_filename = f"mesh_{next(self._mesh_seq)}.glb"
             mesh_path = output_dir / mesh_filename
-            
+
             # triposr returns trimesh objects
-            meshes[0].export(str(mesh_path))
+            meshes[0].export(str(mesh_path), file_type="glb")
             
             logger.info(f"3D mesh saved to: {mesh_path}")
             return str(mesh_path)
@@ -130,32 +524,234 @@ class TripoSRPipeline:
             logger.error(f"Error generating 3D model: {e}")
             raise
 
-    def preprocess_multi_images(self, image_paths: list[str]) -> list[Image.Image]:
-        """Preprocess multiple images for multi-view 3D reconstruction"""
-        processed_images = []
+    def preprocess_multi_images(self, image_paths: list[str]):
+        """Preprocess multiple images into one batched tensor for a single forward"""
+        pil_images = []
 
         for image_path in image_paths[:4]:  # limited to 4 views
             processed_img = self.preprocess_image(image_path)
-            processed_images.append(processed_img)
+            pil_images.append(processed_img)
 
-        # stack images along batch dimension
-        if len(processed_images) == 1:
-            return processed_images[0]
-        else:
-            return processed_images
+        try:
+            # stack into (B, H, W, 3) floats in [0,1] so the model sees one
+            # batch instead of looping views - TripoSR's ImageProcessor takes
+            # 4-D tensors channels-last and does its own permute to NCHW, so
+            # feeding it channels-first would get re-permuted into garbage
+            arrays = [
+                _resize_rgb(img, 512).astype(np.float32) / 255.0
+                for img in pil_images
+            ]
+            batch = torch.from_numpy(np.stack(arrays))
+
+            if GPU_AVAILABLE:
+                # pinned staging + non_blocking overlaps the H2D copy with compute
+                batch = batch.pin_memory().to(self.device, non_blocking=True)
+                batch = batch.half()
+            else:
+                batch = batch.to(self.device)
+
+            return batch
+
+        except Exception as e:
+            logger.warning(f"Batched preprocessing failed ({e}), using PIL image list")
+            return pil_images
 
     async def generate_3d_from_images(self, image_paths: list[str]) -> str:
         """Generate 3D mesh from multiple images (async wrapper)"""
         import asyncio
-        
-        # run synchronous generation in a thread pool
+
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._generate_3d_sync, image_paths)
+
+        # load before routing: a burst of first requests would otherwise all
+        # see session=None, land on the default pool, and hit the session
+        # from several threads once the lock-serialized load finishes
+        if not self._initialized:
+            await loop.run_in_executor(None, self._load_model)
+
+        # coalesce concurrent single-view requests into one batched session
+        # run - separate Run calls don't parallelize inside ORT, one batched
+        # Run scales near-linearly
+        if self.session and len(image_paths) == 1:
+            return await self._enqueue_micro_batch(image_paths[0])
+
+        # run synchronous generation in a thread pool (the serialized session
+        # pool when the ONNX session exists, the default pool otherwise)
+        executor = self._run_pool if self.session else None
+        return await loop.run_in_executor(executor, self._generate_3d_sync, image_paths)
+
+    async def _enqueue_micro_batch(self, image_path: str) -> str:
+        """Put one request on the batching queue and await its mesh"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+            self._batch_consumer_task = loop.create_task(self._micro_batch_consumer())
+
+        future = loop.create_future()
+        await self._batch_queue.put((image_path, future))
+        return await future
+
+    async def _micro_batch_consumer(self):
+        """Drain the queue, coalescing requests up to MICRO_BATCH_MAX / MICRO_BATCH_WAIT"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch_items = [await self._batch_queue.get()]
+
+            # linger briefly for more requests to share the Run (pointless
+            # when the model caps us at one item per Run)
+            if self._max_micro_batch > 1:
+                deadline = loop.time() + MICRO_BATCH_WAIT
+                while len(batch_items) < self._max_micro_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch_items.append(
+                            await asyncio.wait_for(self._batch_queue.get(), timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+            paths = [p for p, _ in batch_items]
+            futures = [f for _, f in batch_items]
+
+            try:
+                mesh_paths = await loop.run_in_executor(
+                    self._run_pool, self._run_micro_batch, paths
+                )
+                for future, mesh_path in zip(futures, mesh_paths):
+                    if not future.cancelled():
+                        future.set_result(mesh_path)
+            except Exception as e:
+                for future in futures:
+                    if not future.cancelled():
+                        future.set_exception(e)
+
+    def _run_micro_batch(self, image_paths: list[str]) -> list[str]:
+        """One session run for N coalesced single-view requests"""
+        logger.info(f"Running micro-batch of {len(image_paths)} requests")
+
+        batch = np.empty(
+            (len(image_paths),) + self._in_buf.shape[1:], dtype=np.float32
+        )
+        for i, image_path in enumerate(image_paths):
+            self._image_to_input(self.preprocess_image(image_path), out=batch[i])
+
+        outputs = self._run_session(batch)
+
+        output_dir = Path("outputs/meshes")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        mesh_paths = []
+        for i in range(len(image_paths)):
+            mesh_file = output_dir / f"mesh_{next(self._mesh_seq)}.obj"
+            self.save_mesh_as_obj(outputs[0][i], str(mesh_file))
+            mesh_paths.append(str(mesh_file))
+
+        return mesh_paths
     
+    def _image_to_input(self, image: Image.Image, out: np.ndarray = None) -> np.ndarray:
+        """
+        Fused PIL -> NCHW float32 conversion.
+
+        Each channel is scaled straight into the preallocated buffer with one
+        np.multiply pass, instead of the astype -> divide -> transpose ->
+        expand_dims chain that materializes four intermediate float arrays
+        and walks the pixels four times.
+        """
+        if out is None:
+            out = self._in_buf[0]
+
+        arr = _resize_rgb(image, ONNX_INPUT_SIZE)  # uint8
+        if self._nhwc:
+            # native PIL layout: one fused scale, no per-channel strides
+            np.multiply(arr, np.float32(1.0 / 255.0), out=out)
+        else:
+            for c in range(3):
+                np.multiply(arr[:, :, c], np.float32(1.0 / 255.0), out=out[c])
+
+        return out
+
+    def _preprocess_onnx_batch(self, image_paths: list[str]) -> np.ndarray:
+        """
+        Preprocess views straight into a single (B, 3, 256, 256) batch.
+
+        Each image is written into its batch[i] slot by _image_to_input, so
+        there are no per-image intermediate arrays and no np.concatenate copy
+        at the end. The single-view case reuses the preallocated input buffer.
+        """
+        paths = image_paths[:4]  # limited to 4 views
+
+        if len(paths) == 1:
+            batch = self._in_buf
+        else:
+            # match whichever layout (NCHW/NHWC) the session expects
+            batch = np.empty(
+                (len(paths),) + self._in_buf.shape[1:], dtype=np.float32
+            )
+
+        for i, image_path in enumerate(paths):
+            self._image_to_input(self.preprocess_image(image_path), out=batch[i])
+
+        return batch
+
+    def _run_session(self, batch: np.ndarray) -> list:
+        """
+        Execute the session, keeping buffers on the device when on DirectML.
+
+        A plain session.run copies the input from host to the DML device and
+        the outputs back on every call; io_binding with device-allocated
+        OrtValues skips both copies, which dominate cost for small workloads.
+        """
+        if "DmlExecutionProvider" in self.session.get_providers():
+            try:
+                io_binding = self.session.io_binding()
+                ortval = ort.OrtValue.ortvalue_from_numpy(batch, "dml", 0)
+                io_binding.bind_ortvalue_input(self.input_name, ortval)
+                io_binding.bind_output(self.output_name, "dml")
+
+                self.session.run_with_iobinding(io_binding)
+
+                # only materialize on the host when serializing the mesh
+                return [out.numpy() for out in io_binding.get_outputs()]
+
+            except Exception as e:
+                logger.warning(f"io_binding run failed ({e}), using plain run")
+
+        return self.session.run(None, {self.input_name: batch})
+
+    def _generate_3d_onnx(self, image_paths: list[str]) -> str:
+        """Run the ONNX session and serialize the resulting mesh"""
+        logger.info(f"Generating 3D model via ONNX Runtime from {len(image_paths)} images")
+
+        batch = self._preprocess_onnx_batch(image_paths)
+
+        outputs = self._run_session(batch)
+
+        output_dir = Path("outputs/meshes")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        mesh_file = output_dir / f"mesh_{next(self._mesh_seq)}.obj"
+        # strip the batch dim like _run_micro_batch does - passing the whole
+        # batched output would fail the array check and fall back to the
+        # placeholder
+        self.save_mesh_as_obj(outputs[0][0], str(mesh_file))
+
+        logger.info(f"3D mesh saved to {mesh_file}")
+        return str(mesh_file)
+
     def _generate_3d_sync(self, image_paths: list[str]) -> str:
         """Synchronous 3D generation"""
         self._load_model()
-        
+
+        if self.session:
+            return self._generate_3d_onnx(image_paths)
+
         # generate a placeholder mesh if model not available
         if not self.model:
             logger.warning("TripoSR model not available, generating placeholder mesh")
@@ -165,20 +761,33 @@ class TripoSRPipeline:
             logger.info(f"Generating 3D model from {len(image_paths)} images")
 
             images = self.preprocess_multi_images(image_paths)
-            
-            if not isinstance(images, list):
-                images = [images]
 
-            with torch.no_grad():
-                scene_codes = self.model(images, device=self.device)
-                meshes = self.model.extract_mesh(scene_codes)
+            try:
+                with torch.inference_mode():
+                    with torch.autocast("cuda", dtype=torch.float16, enabled=GPU_AVAILABLE):
+                        scene_codes = self.model(images, device=self.device)
+                        meshes = self.model.extract_mesh(scene_codes)
+            except Exception as e:
+                if not torch.is_tensor(images):
+                    raise
+                # the batched tensor was rejected by the model - redo the
+                # forward with the PIL list rather than failing the task
+                logger.warning(
+                    f"Batched tensor forward failed ({e}), retrying with PIL list"
+                )
+                pil_images = [self.preprocess_image(p) for p in image_paths[:4]]
+                with torch.inference_mode():
+                    with torch.autocast("cuda", dtype=torch.float16, enabled=GPU_AVAILABLE):
+                        scene_codes = self.model(pil_images, device=self.device)
+                        meshes = self.model.extract_mesh(scene_codes)
 
             # save mesh to outputs dir
             output_dir = Path("outputs/meshes")
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            mesh_file = output_dir / f"mesh_{os.urandom(4).hex()}.obj"
-            meshes[0].export(str(mesh_file))
+            # binary glb: one packed buffer write instead of O(V+F) text formatting
+            mesh_file = output_dir / f"mesh_{next(self._mesh_seq)}.glb"
+            meshes[0].export(str(mesh_file), file_type="glb")
 
             logger.info(f"3D mesh saved to {mesh_file}")
             return str(mesh_file)
@@ -192,7 +801,7 @@ class TripoSRPipeline:
         output_dir = Path("outputs/meshes")
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        mesh_file = output_dir / f"placeholder_{os.urandom(4).hex()}.obj"
+        mesh_file = output_dir / f"placeholder_{next(self._mesh_seq)}.obj"
         
         with open(mesh_file, 'w') as f:
             f.write("# Placeholder mesh - TripoSR model not available\n")
@@ -214,7 +823,8 @@ class TripoSRPipeline:
         try:
             with open(output_path, "w") as f:
                 f.write("# Generated by TripoSR\n")
-                self.write_placeholder_cube(f)
+                if not self._write_mesh_arrays(f, mesh_data):
+                    self.write_placeholder_cube(f)
 
             logger.info(f"Mesh saved as OBJ: {output_path}")
 
@@ -222,56 +832,47 @@ class TripoSRPipeline:
             logger.error(f"Error saving mesh: {e}")
             raise
 
+    @staticmethod
+    def _write_mesh_arrays(file_handle, mesh_data) -> bool:
+        """
+        Write (vertices, faces) arrays as OBJ via np.savetxt.
+
+        savetxt formats each row in C instead of a python f-string per
+        vertex/face, which is the bottleneck for 10k+ vert meshes. Returns
+        False when mesh_data isn't a usable array pair so the caller can
+        fall back to the placeholder.
+        """
+        if isinstance(mesh_data, (tuple, list)) and len(mesh_data) == 2:
+            vertices, faces = mesh_data
+        else:
+            vertices, faces = mesh_data, None
+
+        vertices = np.asarray(vertices)
+        if vertices.ndim != 2 or vertices.shape[1] != 3 or vertices.shape[0] == 0:
+            return False
+
+        np.savetxt(file_handle, vertices, fmt="v %.6f %.6f %.6f")
+        if faces is not None:
+            # OBJ face indices are 1-based
+            np.savetxt(file_handle, np.asarray(faces, dtype=np.int64) + 1, fmt="f %d %d %d")
+        return True
+
     def write_placeholder_cube(self, file_handle):
         """
         Write a placeholder cube mesh (for testing purposes)
         """
-        # simple cube vertices
-        vertices = [
-            [-1, -1, -1],
-            [1, -1, -1],
-            [1, 1, -1],
-            [-1, 1, -1],  # Bottom face
-            [-1, -1, 1],
-            [1, -1, 1],
-            [1, 1, 1],
-            [-1, 1, 1],  # Top face
-        ]
-
-        # cube faces (triangulated)
-        faces = [
-            [1, 2, 3],
-            [1, 3, 4],  # Bottom
-            [5, 6, 7],
-            [5, 7, 8],  # Top
-            [1, 2, 6],
-            [1, 6, 5],  # Front
-            [3, 4, 8],
-            [3, 8, 7],  # Back
-            [2, 3, 7],
-            [2, 7, 6],  # Right
-            [1, 4, 8],
-            [1, 8, 5],  # Left
-        ]
-
-        # write vertices
-        for vertex in vertices:
-            file_handle.write(f"v {vertex[0]} {vertex[1]} {vertex[2]}\n")
-
-        # write faces
-        for face in faces:
-            file_handle.write(f"f {face[0]} {face[1]} {face[2]}\n")
+        # precomputed at import - a single write, no per-call formatting
+        file_handle.write(_PLACEHOLDER_CUBE_OBJ)
 
     def cleanup_temp_meshes(self):
         """Clean up temporary mesh files"""
+        # recreate the directory wholesale - one C-level tree removal instead
+        # of a stat + unlink syscall pair per file
         temp_dir = Path("temp/meshes")
-        if temp_dir.exists():
-            for file in temp_dir.glob("*.obj"):
-                try:
-                    file.unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to delete {file}: {e}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir(parents=True, exist_ok=True)
 
 
-# init global instance
-triposr_pipeline = TripoSRPipeline()
+# No module-level instance: importing this module must stay cheap (no model
+# load, no ORT session, no device memory). main.py owns the singleton and can
+# pass lazy_load=False to preload on GPU hosts.
@@ -15,8 +15,9 @@ BACKEND_DIR = Path(__file__).parent
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from inference.triposr_runner import TripoSRPipeline
+from inference.triposr_runner import GPU_AVAILABLE, TripoSRPipeline
 from blender.blender_preprocess import BlenderProcessor
+from task_store import TaskStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,14 +32,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-os.makedirs("uploads", exist_ok=True)
-os.makedirs("outputs", exist_ok=True)
-os.makedirs("temp", exist_ok=True)
+# check_dir=False so mounting doesn't require the directories at import
+# time - they're created once in the startup handler below
+app.mount("/files/outputs", StaticFiles(directory="outputs", check_dir=False), name="outputs")
+app.mount("/files/uploads", StaticFiles(directory="uploads", check_dir=False), name="uploads")
 
-app.mount("/files/outputs", StaticFiles(directory="outputs"), name="outputs")
-app.mount("/files/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-triposr = TripoSRPipeline(lazy_load=True)
+@app.on_event("startup")
+async def create_working_dirs():
+    """Create the working directories once per server start, not per import"""
+    for directory in ("uploads", "outputs", "temp"):
+        os.makedirs(directory, exist_ok=True)
+
+# preload on GPU hosts so the first request skips the model load;
+# lazy on CPU-only setups where startup latency matters more
+triposr = TripoSRPipeline(lazy_load=not GPU_AVAILABLE)
 blender_processor = BlenderProcessor()
 
 
@@ -66,9 +74,9 @@ class TaskStatus(BaseModel):
     error: Optional[str] = None
 
 
-# in-memory task store
-tasks = {}
-task_counter = 0
+# sqlite-backed task store: state survives restarts and is shared when
+# uvicorn runs with --workers N (an in-process dict is per-worker)
+tasks = TaskStore()
 
 
 @app.get("/")
@@ -89,13 +97,11 @@ async def health_check():
 @app.post("/generate/image-to-ugc", response_model=GenerationResponse)
 async def generate_ugc_from_image(file: UploadFile = File(...)):
     """Generate UGC asset from uploaded image"""
-    global task_counter
-    
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    task_counter += 1
-    task_id = f"task_{task_counter}"
+    # minted in sqlite so concurrent workers can't pick the same id
+    task_id = tasks.next_task_id()
 
     # save uploaded image
     upload_dir = Path("uploads")
@@ -103,15 +109,20 @@ async def generate_ugc_from_image(file: UploadFile = File(...)):
     safe_filename = "".join(c for c in file.filename if c.isalnum() or c in "._-")
     file_path = upload_dir / f"{task_id}_{safe_filename}"
 
+    # stream to disk in 1MB chunks so a large upload never sits fully in RAM
+    # and the disk write overlaps with the socket read
     with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-
-    tasks[task_id] = TaskStatus(
-        task_id=task_id,
-        status="queued",
-        progress=0,
-        current_step="Processing uploaded image",
+        while chunk := await file.read(1 << 20):
+            buffer.write(chunk)
+
+    tasks.put(
+        task_id,
+        TaskStatus(
+            task_id=task_id,
+            status="queued",
+            progress=0,
+            current_step="Processing uploaded image",
+        ).model_dump(),
     )
 
     asyncio.create_task(process_image_to_ugc(task_id, str(file_path)))
@@ -124,92 +135,57 @@ async def generate_ugc_from_image(file: UploadFile = File(...)):
 @app.get("/task/{task_id}", response_model=TaskStatus)
 async def get_task_status(task_id: str):
     """Get status of a generation task"""
-    if task_id not in tasks:
+    task = tasks.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks[task_id]
+    return TaskStatus(**task)
 
 
 @app.get("/download/{task_id}")
 async def download_result(task_id: str, format: str = "fbx"):
     """Download the generated UGC file"""
-    if task_id not in tasks:
+    task = tasks.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task = tasks[task_id]
-    if task.status != "completed" or not task.result_url:
+    if task["status"] != "completed" or not task["result_url"]:
         raise HTTPException(
             status_code=400, detail="Task not completed or no result available"
         )
 
-    return FileResponse(task.result_url, filename=f"ugc_{task_id}.rbxm")
-
-
-async def process_text_to_ugc(task_id: str, request: GenerationRequest):
-    """Background task to process text-to-UGC generation"""
-    try:
-        # generate images from text
-        tasks[task_id].status = "processing"
-        tasks[task_id].progress = 10
-        tasks[task_id].current_step = "Generating images from text"
-
-        images = await text2image.generate_images(
-            prompt=request.prompt,
-            style=request.style,
-            negative_prompt=request.negative_prompt,
-            num_images=request.num_images,
-        )
-
-        # generate 3d model
-        tasks[task_id].progress = 40
-        tasks[task_id].current_step = "Creating 3D model from images"
-
-        mesh_data = await triposr.generate_3d_from_images(images)
-
-        # process in blender
-        tasks[task_id].progress = 70
-        tasks[task_id].current_step = "Optimizing for Roblox"
-
-        result_path = await blender_processor.process_for_roblox(mesh_data, task_id)
-
-        # confirm completion
-        tasks[task_id].progress = 100
-        tasks[task_id].current_step = "Complete"
-        tasks[task_id].status = "completed"
-        tasks[task_id].result_url = result_path
-
-    except Exception as e:
-        tasks[task_id].status = "failed"
-        tasks[task_id].error = str(e)
-        tasks[task_id].current_step = "Failed"
+    return FileResponse(task["result_url"], filename=f"ugc_{task_id}.rbxm")
 
 
 async def process_image_to_ugc(task_id: str, image_path: str):
     """Background task to process image-to-UGC generation"""
     try:
         # step 1: processing image
-        tasks[task_id].status = "processing"
-        tasks[task_id].progress = 20
-        tasks[task_id].current_step = "Processing uploaded image"
+        tasks.update(
+            task_id,
+            status="processing",
+            progress=20,
+            current_step="Processing uploaded image",
+        )
         logger.info(f"[{task_id}] Starting image processing: {image_path}")
-        
+
         await asyncio.sleep(0.5)
 
         # step 2: generate 3d model
-        tasks[task_id].progress = 50
-        tasks[task_id].current_step = "Creating 3D model from image"
+        tasks.update(
+            task_id, progress=50, current_step="Creating 3D model from image"
+        )
         logger.info(f"[{task_id}] Creating 3D model from image")
 
         try:
             mesh_path = await triposr.generate_3d_from_single_image(image_path)
-            tasks[task_id].mesh_url = mesh_path
+            tasks.update(task_id, mesh_url=mesh_path)
             logger.info(f"[{task_id}] 3D mesh generated: {mesh_path}")
         except Exception as e:
             logger.error(f"[{task_id}] TripoSR error: {e}")
             raise Exception(f"3D generation failed: {str(e)}")
 
         # step 3: process in Blender (if Blender is available)
-        tasks[task_id].progress = 80
-        tasks[task_id].current_step = "Optimizing for Roblox"
+        tasks.update(task_id, progress=80, current_step="Optimizing for Roblox")
         
         result_path = mesh_path  # Default to the OBJ file
         
@@ -224,20 +200,21 @@ async def process_image_to_ugc(task_id: str, image_path: str):
                 # continue with OBJ file if Blender fails
         else:
             logger.info(f"[{task_id}] Blender not available, using raw OBJ")
-            tasks[task_id].current_step = "Blender not found - using OBJ format"
+            tasks.update(task_id, current_step="Blender not found - using OBJ format")
 
         # step 4: complete
-        tasks[task_id].progress = 100
-        tasks[task_id].current_step = "Complete"
-        tasks[task_id].status = "completed"
-        tasks[task_id].result_url = result_path
+        tasks.update(
+            task_id,
+            progress=100,
+            current_step="Complete",
+            status="completed",
+            result_url=result_path,
+        )
         logger.info(f"[{task_id}] Task completed")
 
     except Exception as e:
         logger.error(f"[{task_id}] Task failed: {e}")
-        tasks[task_id].status = "failed"
-        tasks[task_id].error = str(e)
-        tasks[task_id].current_step = "Failed"
+        tasks.update(task_id, status="failed", error=str(e), current_step="Failed")
 
 
 if __name__ == "__main__":
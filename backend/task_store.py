@@ -0,0 +1,79 @@
+"""
+SQLite-backed task store for the pipeline API.
+
+Replaces the in-process `tasks = {}` dict: task state survives restarts and
+is shared correctly when uvicorn runs with --workers N, since every worker
+talks to the same WAL-mode database file instead of its own dict.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class TaskStore:
+    """Tiny key-value store of task_id -> task state (JSON)"""
+
+    def __init__(self, db_path: str = "temp/tasks.db"):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # check_same_thread=False: updates come from executor threads too;
+        # a lock serializes access since sqlite3 connections aren't threadsafe
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "task_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        # AUTOINCREMENT sequence shared by every worker process - a
+        # per-process counter would mint duplicate ids under --workers N
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_ids ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def next_task_id(self) -> str:
+        """Mint a process-safe sequential task id like task_7"""
+        with self._lock:
+            cursor = self._conn.execute("INSERT INTO task_ids DEFAULT VALUES")
+            self._conn.commit()
+        return f"task_{cursor.lastrowid}"
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def put(self, task_id: str, data: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, data) VALUES (?, ?)",
+                (task_id, json.dumps(data)),
+            )
+            self._conn.commit()
+
+    def get(self, task_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, task_id: str, **fields):
+        """Merge fields into an existing task's state"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return
+            data = json.loads(row[0])
+            data.update(fields)
+            self._conn.execute(
+                "UPDATE tasks SET data = ? WHERE task_id = ?",
+                (json.dumps(data), task_id),
+            )
+            self._conn.commit()
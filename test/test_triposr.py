@@ -1,90 +1,217 @@
+import argparse
+import importlib.util
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+# load CUDA libraries on first kernel use instead of at import torch - keeps
+# the smoke test's GPU memory footprint near zero
+os.environ.setdefault("CUDA_MODULE_LOADING", "LAZY")
 
-print("=" * 60)
-print("Testing TripoSR Pipeline Setup")
-print("=" * 60)
+# resolved once - every later path derives from these instead of rebuilding
+# Path(__file__) chains
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
 
-# Test 1: Check PyTorch and GPU
-print("\n[1/5] Checking PyTorch installation...")
-try:
-    import torch
-    print(f"✓ PyTorch version: {torch.__version__}")
-    print(f"✓ CUDA available: {torch.cuda.is_available()}")
-    if torch.cuda.is_available():
-        print(f"✓ GPU: {torch.cuda.get_device_name(0)}")
+# only grow sys.path when the directory actually exists and isn't already
+# first - every stray entry lengthens each subsequent import's finder scan
+_backend_dir = str(ROOT / "backend")
+if os.path.isdir(_backend_dir) and (not sys.path or sys.path[0] != _backend_dir):
+    sys.path.insert(0, _backend_dir)
+
+# TRIPOSR_PREWARM=1 compiles the backend sources up front (across all cores)
+# so the runner import in test 4 hits warm .pyc instead of compiling inline
+if os.environ.get("TRIPOSR_PREWARM") == "1":
+    import compileall
+
+    compileall.compile_dir(_backend_dir, quiet=1, workers=0)
+
+# status prefixes interned once - the multi-byte glyphs aren't re-embedded
+# (and re-encoded) in every message literal
+OK = "✓ "
+FAIL = "✗ "
+WARN = "⚠ "
+
+# (import_name, distribution_name) pairs - a flat tuple iterates without the
+# dict_items view and per-entry hashing a dict would do
+REQUIRED = (
+    ("PIL", "Pillow"),
+    ("omegaconf", "omegaconf"),
+    ("einops", "einops"),
+    ("transformers", "transformers"),
+    ("trimesh", "trimesh"),
+    ("huggingface_hub", "huggingface-hub"),
+)
+
+
+# CUDA probe results shared between test 1 and test 5 - initializing the
+# driver context once is the dominant first-touch cost, so don't do it twice
+CUDA = {"available": False, "name": None}
+
+
+def check_pytorch():
+    """Test 1: PyTorch install + CUDA availability"""
+    out = ["\n[1/5] Checking PyTorch installation..."]
+    try:
+        import torch
+        out.append(OK + f"PyTorch version: {torch.__version__}")
+        CUDA["available"] = torch.cuda.is_available()  # probe once, the call isn't free
+        out.append(OK + f"CUDA available: {CUDA['available']}")
+        if CUDA["available"]:
+            try:
+                CUDA["name"] = torch.cuda.get_device_name(0)
+                out.append(OK + f"GPU: {CUDA['name']}")
+            except Exception as e:
+                out.append(WARN + f"Could not query GPU name: {e}")
+        else:
+            out.append(WARN + "No GPU detected - will use CPU (slower)")
+        return True, out
+    except ImportError as e:
+        out.append(FAIL + f"PyTorch not installed: {e}")
+        return False, out
+
+
+def check_triposr_repo():
+    """Test 2: TripoSR checkout present with the tsr package inside"""
+    out = ["\n[2/5] Checking TripoSR repository..."]
+    triposr_path = HERE / "models" / "TripoSR"
+    # os.path checks are thinner wrappers around stat than Path.exists(),
+    # and assert the type (dir/file) we actually depend on
+    if os.path.isdir(triposr_path):
+        out.append(OK + f"TripoSR found at: {triposr_path}")
+        tsr_system = triposr_path.joinpath("tsr", "system.py")
+        if os.path.isfile(tsr_system):
+            out.append(OK + "TSR system module exists")
+            return True, out
+        out.append(FAIL + f"TSR system module not found at {tsr_system}")
+        return False, out
+    out.append(FAIL + f"TripoSR not found at: {triposr_path}")
+    out.append("  Clone it with: git clone https://github.com/VAST-AI-Research/TripoSR.git models/TripoSR")
+    return False, out
+
+
+def check_dependencies():
+    """Test 3: required packages installed"""
+    out = ["\n[3/5] Checking dependencies..."]
+    missing = []
+    for module, package in REQUIRED:
+        # find_spec only consults the import finders - it doesn't execute the
+        # module, so heavy packages like transformers don't get loaded just to
+        # prove they're installed
+        if importlib.util.find_spec(module) is not None:
+            out.append(OK + package)
+        else:
+            out.append(FAIL + package + " (missing)")
+            missing.append(package)
+
+    if missing:
+        out.append("\n" + WARN + f"Missing packages: {', '.join(missing)}")
+        out.append("   Install with: pip install -r backend/triposr_requirements.txt")
+        return False, out
+    return True, out
+
+
+def emit(lines):
+    """Flush a block of output with one write instead of a print per line"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="TripoSR pipeline smoke test")
+    ap.add_argument(
+        "--quick",
+        action="store_true",
+        help="stop after the import checks - skips pipeline init (and with "
+        "it any CUDA context allocation)",
+    )
+    args = ap.parse_args()
+
+    emit(["=" * 60, "Testing TripoSR Pipeline Setup", "=" * 60])
+
+    # tests 1-3 are independent: the filesystem stats and spec lookups
+    # release the GIL, so they overlap with torch's import and the wall
+    # clock is roughly the slowest check instead of the sum
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        torch_future = pool.submit(check_pytorch)
+        repo_future = pool.submit(check_triposr_repo)
+        deps_future = pool.submit(check_dependencies)
+
+        results = [torch_future.result(), repo_future.result(), deps_future.result()]
+
+    # collect every failure and report them together at the end - one run
+    # surfaces all problems instead of one per (torch-importing) rerun
+    errors = []
+
+    # emit in deterministic test order regardless of completion order, as a
+    # single buffered write rather than a print (and flush) per line
+    block = []
+    for number, (ok, messages) in enumerate(results, start=1):
+        block.extend(messages)
+        if not ok:
+            errors.append(f"test {number} failed - see output above")
+    emit(block)
+
+    # Test 4: import TripoSR runner (depends on tests 1-3)
+    TripoSRPipeline = None
+    block = ["\n[4/5] Testing TripoSR runner import..."]
+    if errors:
+        block.append(WARN + "Skipped: fix the failures above first")
     else:
-        print("⚠ No GPU detected - will use CPU (slower)")
-except ImportError as e:
-    print(f"✗ PyTorch not installed: {e}")
-    sys.exit(1)
-
-# Test 2: Check TripoSR path
-print("\n[2/5] Checking TripoSR repository...")
-triposr_path = Path(__file__).parent / "models" / "TripoSR"
-if triposr_path.exists():
-    print(f"✓ TripoSR found at: {triposr_path}")
-    tsr_system = triposr_path / "tsr" / "system.py"
-    if tsr_system.exists():
-        print(f"✓ TSR system module exists")
+        try:
+            # import_module keeps the heavy transitive imports (torch,
+            # transformers, trimesh) out of reach until tests 1-3 have
+            # actually proven the environment can support them
+            runner = importlib.import_module("inference.triposr_runner")
+            TripoSRPipeline = runner.TripoSRPipeline
+            block.append(OK + "TripoSR runner imported successfully")
+        except ImportError as e:
+            block.append(FAIL + f"Failed to import TripoSR runner: {e}")
+            errors.append(f"test 4 failed: {e}")
+    emit(block)
+
+    # Test 5: initialize pipeline (depends on test 4)
+    block = []
+    if args.quick:
+        block.append("\n[5/5] Skipped (--quick): pipeline init not exercised")
+    elif TripoSRPipeline is None:
+        block.append("\n[5/5] Skipped: runner import did not succeed")
     else:
-        print(f"✗ TSR system module not found at {tsr_system}")
+        block.append("\n[5/5] Initializing TripoSR pipeline...")
+        try:
+            # TRIPOSR_COMPILE=1 exercises the torch.compile path on GPU hosts
+            compile_flag = os.environ.get("TRIPOSR_COMPILE") == "1"
+            # reuse test 1's CUDA probe so the pipeline skips its own
+            pipeline = TripoSRPipeline(
+                lazy_load=True,
+                compile_model=compile_flag,
+                device="cuda" if CUDA["available"] else "cpu",
+            )
+            block.append(OK + "Pipeline initialized (lazy load mode)")
+            block.append(OK + f"Device: {pipeline.device}")
+        except Exception as e:
+            block.append(FAIL + f"Failed to initialize pipeline: {e}")
+            errors.append(f"test 5 failed: {e}")
+    emit(block)
+
+    block = ["\n" + "=" * 60]
+    if errors:
+        block.append(FAIL + f"{len(errors)} check(s) failed:")
+        block.extend(f"  - {error}" for error in errors)
+        block.append("=" * 60)
+        emit(block)
         sys.exit(1)
-else:
-    print(f"✗ TripoSR not found at: {triposr_path}")
-    print("  Clone it with: git clone https://github.com/VAST-AI-Research/TripoSR.git models/TripoSR")
-    sys.exit(1)
-
-# Test 3: Check dependencies
-print("\n[3/5] Checking dependencies...")
-required_modules = {
-    "PIL": "Pillow",
-    "omegaconf": "omegaconf",
-    "einops": "einops",
-    "transformers": "transformers",
-    "trimesh": "trimesh",
-    "huggingface_hub": "huggingface-hub"
-}
-
-missing = []
-for module, package in required_modules.items():
-    try:
-        __import__(module)
-        print(f"✓ {package}")
-    except ImportError:
-        print(f"✗ {package} (missing)")
-        missing.append(package)
-
-if missing:
-    print(f"\n⚠ Missing packages: {', '.join(missing)}")
-    print(f"   Install with: pip install -r backend/triposr_requirements.txt")
-    sys.exit(1)
-
-# Test 4: Import TripoSR runner
-print("\n[4/5] Testing TripoSR runner import...")
-try:
-    from inference.triposr_runner import TripoSRPipeline
-    print("✓ TripoSR runner imported successfully")
-except ImportError as e:
-    print(f"✗ Failed to import TripoSR runner: {e}")
-    sys.exit(1)
-
-# Test 5: Initialize pipeline
-print("\n[5/5] Initializing TripoSR pipeline...")
-try:
-    pipeline = TripoSRPipeline(lazy_load=True)
-    print("✓ Pipeline initialized (lazy load mode)")
-    print(f"✓ Device: {pipeline.device}")
-except Exception as e:
-    print(f"✗ Failed to initialize pipeline: {e}")
-    sys.exit(1)
-
-print("\n" + "=" * 60)
-print("✓ All checks passed!")
-print("=" * 60)
-print("\nNext steps:")
-print("1. Place a test image in the project directory")
-print("2. Run: python -c \"from backend.inference.triposr_runner import triposr_pipeline; print(triposr_pipeline.generate_3d('your_image.png'))\"")
-print("3. Or create a web server with FastAPI (see next steps)")
+
+    block.append(OK + "Quick checks passed!" if args.quick else OK + "All checks passed!")
+    block.append("=" * 60)
+    if not args.quick:
+        block.append("\nNext steps:")
+        block.append("1. Place a test image in the project directory")
+        block.append("2. Run: python -c \"from inference.triposr_runner import TripoSRPipeline; print(TripoSRPipeline(lazy_load=False).generate_3d('your_image.png'))\" (from backend/)")
+        block.append("3. Or create a web server with FastAPI (see next steps)")
+    emit(block)
+
+
+if __name__ == "__main__":
+    main()